@@ -17,7 +17,7 @@ def main(inputBlob: func.InputStream):
     logging.info(
         f"{log_prefix} Processing Azure blob: {inputBlob.name} ({inputBlob.length} bytes)"
     )
-    processor = Processor(log_prefix, 100000)
+    processor = Processor(log_prefix)
     try:
         processor.load(inputBlob)
         processor.update_geometries()
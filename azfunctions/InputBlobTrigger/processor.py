@@ -1,27 +1,85 @@
 # Standard library
-import io
 import logging
 import math
 import os
+import shutil
+import tempfile
 import time
 
 # Third party
 import azure.functions as func
+import numpy as np
 import pandas as pd
 import psycopg2
-from shapely.geometry import Polygon
 import xarray
 
 # Local
 from .progress import Progress
-from .utils import batches, human_readable, InputBlobTriggerException, mean_step_size
+from .utils import (
+    human_readable,
+    InputBlobTriggerException,
+    mean_step_size,
+    pgcopy_binary,
+    POSTGRES_EPOCH,
+    QUANTISATION_SCALE,
+    quantise,
+)
+
+
+# Database connection reused by warm invocations in the same worker
+_CNXN = None
+# Grids whose geometries have been loaded by this worker
+_LOADED_GRIDS = set()
+
+
+def get_cnxn(log_prefix):
+    """Return the shared database connection, reconnecting if it is no longer alive."""
+    global _CNXN
+    if _CNXN and not _CNXN.closed:
+        try:
+            with _CNXN.cursor() as cursor:
+                cursor.execute("SELECT 1;")
+            _CNXN.rollback()
+            return _CNXN
+        except (psycopg2.InterfaceError, psycopg2.OperationalError) as exc:
+            logging.warning(
+                f"{log_prefix} Existing database connection is unusable: {' '.join(str(exc).split())}."
+            )
+            close_cnxn()
+    try:
+        db_host = os.getenv("PSQL_HOST")
+        db_name = os.getenv("PSQL_DB")
+        db_user = os.getenv("PSQL_USER")
+        db_pwd = os.getenv("PSQL_PWD")
+        _CNXN = psycopg2.connect(
+            dbname=db_name,
+            port="5432",
+            user=f"{db_user}@{db_host}",
+            password=db_pwd,
+            host=db_host,
+            sslmode="require",
+        )
+        logging.info(f"{log_prefix} Connected to database {db_name} on {db_host}.")
+    except (Exception, psycopg2.OperationalError) as exc:
+        logging.error(
+            f"{log_prefix} Failed to connect to database {db_name} on {db_host}!"
+        )
+        raise InputBlobTriggerException(exc)
+    return _CNXN
+
+
+def close_cnxn():
+    """Close the shared database connection so that the next request reconnects."""
+    global _CNXN
+    if _CNXN:
+        _CNXN.close()
+        _CNXN = None
 
 
 class Processor:
-    def __init__(self, log_prefix, batch_size):
+    def __init__(self, log_prefix):
         """Constructor."""
         self.log_prefix = log_prefix
-        self.batch_size = batch_size
         self.cnxn_ = None
         self.cursor_ = None
         self.tables = {
@@ -49,36 +107,11 @@ class Processor:
         self.forecasts = None
         self.hemisphere = None
 
-    def __del__(self):
-        """Destructor."""
-        if self.cnxn_:
-            self.cnxn_.close()
-
     @property
     def cnxn(self):
-        """Connect to the database or return an existing connection."""
+        """Return the shared database connection, checking it once per invocation."""
         if not self.cnxn_:
-            try:
-                db_host = os.getenv("PSQL_HOST")
-                db_name = os.getenv("PSQL_DB")
-                db_user = os.getenv("PSQL_USER")
-                db_pwd = os.getenv("PSQL_PWD")
-                self.cnxn_ = psycopg2.connect(
-                    dbname=db_name,
-                    port="5432",
-                    user=f"{db_user}@{db_host}",
-                    password=db_pwd,
-                    host=db_host,
-                    sslmode="require",
-                )
-                logging.info(
-                    f"{self.log_prefix} Connected to database {db_name} on {db_host}."
-                )
-            except (Exception, psycopg2.OperationalError) as exc:
-                logging.error(
-                    f"{self.log_prefix} Failed to connect to database {db_name} on {db_host}!"
-                )
-                raise InputBlobTriggerException(exc)
+            self.cnxn_ = get_cnxn(self.log_prefix)
         return self.cnxn_
 
     @property
@@ -88,14 +121,38 @@ class Processor:
             self.cursor_ = self.cnxn.cursor()
         return self.cursor_
 
-    def db_execute_and_commit(self, cmd, retry=5):
+    def db_execute_and_commit(self, cmd, params=None, retry=5):
         """Execute and commit an SQL statement. On failure reset the connection and retry after an exponential delay"""
+        self.db_commit_with_retry(lambda: self.cursor.execute(cmd, params), retry)
+
+    def db_copy_and_commit(self, cmd_stage, cmd_copy, buffer, cmd_insert, retry=5):
+        """Load a buffer into a staging table with COPY, insert the staged rows and commit. On failure reset the connection and retry after an exponential delay"""
+
+        def copy_and_insert():
+            buffer.seek(0)
+            self.cursor.execute(cmd_stage)
+            self.cursor.copy_expert(cmd_copy, buffer)
+            self.cursor.execute(cmd_insert)
+
+        self.db_commit_with_retry(copy_and_insert, retry)
+
+    def db_fetch_one(self, cmd, params=None, retry=5):
+        """Execute an SQL query and return the first row of its result. On failure reset the connection and retry after an exponential delay"""
+
+        def execute_and_fetch():
+            self.cursor.execute(cmd, params)
+            return self.cursor.fetchone()
+
+        return self.db_commit_with_retry(execute_and_fetch, retry)
+
+    def db_commit_with_retry(self, operation, retry=5):
+        """Run a database operation and commit. On failure reset the connection and retry after an exponential delay"""
         retry_counter = 1
         while True:
             try:
-                self.cursor.execute(cmd)
+                result = operation()
                 self.cnxn.commit()
-                break
+                return result
             except (Exception, psycopg2.OperationalError) as exc:
                 logging.warning(
                     f"{self.log_prefix} Database connection attempt {retry_counter}/{retry} failed."
@@ -110,78 +167,92 @@ class Processor:
                         f"{self.log_prefix} Waiting {human_readable(retry_seconds)} before retrying."
                     )
                     self.cursor_ = None
-                    self.cnxn.close()
                     self.cnxn_ = None
+                    close_cnxn()
                     time.sleep(retry_seconds)
 
     def load(self, inputBlob: func.InputStream) -> None:
         """Load data from a file into an xarray."""
         logging.info(f"{self.log_prefix} Attempting to load {inputBlob.name}...")
         try:
-            xr = xarray.open_dataset(io.BytesIO(inputBlob.read()))
-            logging.info(
-                f"{self.log_prefix} Loaded NetCDF data into array with dimensions: {xr.dims}."
-            )
-            # Compatibility with old file format
-            compatibility = {}
-            data_variables = list(xr.keys())
-            if "mean" in data_variables:
-                compatibility["mean"] = "sic_mean"
-            if "stddev" in data_variables:
-                compatibility["stddev"] = "sic_stddev"
-            if compatibility:
-                xr = xr.rename(compatibility)
-            logging.info(
-                f"{self.log_prefix} Identified data variables: {list(xr.keys())}."
-            )
-            # Try to identify hemisphere from geospatial extent
-            if xr.attrs.get("geospatial_lat_max", 0) > 80:
-                self.hemisphere = "north"
-            elif xr.attrs.get("geospatial_lat_min", 0) < -80:
-                self.hemisphere = "south"
-            # Otherwise try to do so from keywords
-            if not self.hemisphere:
-                keywords = xr.attrs.get("keywords", "").lower()
-                if "north" in keywords and "south" not in keywords:
-                    self.hemisphere = "north"
-                if "south" in keywords and "north" not in keywords:
-                    self.hemisphere = "south"
-            if not self.hemisphere:
-                raise InputBlobTriggerException("Could not identify hemisphere!")
-            logging.info(
-                f"{self.log_prefix} Identified data as belonging to the {self.hemisphere}ern hemisphere."
-            )
-            # Read array into appropriate data structures
-            logging.info(f"{self.log_prefix} Loading forecasts from input data...")
-            self.centroids_m["x"] = [int(1000 * x_km) for x_km in xr.xc.values]
-            self.centroids_m["y"] = [int(1000 * y_km) for y_km in xr.yc.values]
-            self.forecasts = (
-                xr.where(xr["sic_mean"] > 0).to_dataframe().dropna().reset_index()
-            )
-            self.forecasts["xc_m"] = pd.to_numeric(
-                1000 * self.forecasts["xc"], downcast="integer"
-            )
-            self.forecasts["yc_m"] = pd.to_numeric(
-                1000 * self.forecasts["yc"], downcast="integer"
-            )
-            self.forecasts["time_forecast"] = self.forecasts["time"] + pd.to_timedelta(
-                self.forecasts["leadtime"], unit="D"
-            )
-            self.forecasts.drop(
-                columns=[
-                    "yc",
-                    "xc",
-                    "leadtime",
-                    "Lambert_Azimuthal_Grid",
-                    "lat",
-                    "lon",
-                ],
-                inplace=True,
-            )
-            logging.info(
-                f"{self.log_prefix} Loaded {self.forecasts.shape[0]} forecasts from input data."
-            )
-            del xr
+            # Stream the blob to a temporary file rather than holding a second copy in memory
+            with tempfile.NamedTemporaryFile(suffix=".nc") as blob_file:
+                shutil.copyfileobj(inputBlob, blob_file)
+                blob_file.flush()
+                with xarray.open_dataset(blob_file.name) as xr:
+                    logging.info(
+                        f"{self.log_prefix} Loaded NetCDF data into array with dimensions: {xr.dims}."
+                    )
+                    # Compatibility with old file format
+                    compatibility = {}
+                    data_variables = list(xr.keys())
+                    if "mean" in data_variables:
+                        compatibility["mean"] = "sic_mean"
+                    if "stddev" in data_variables:
+                        compatibility["stddev"] = "sic_stddev"
+                    if compatibility:
+                        xr = xr.rename(compatibility)
+                    logging.info(
+                        f"{self.log_prefix} Identified data variables: {list(xr.keys())}."
+                    )
+                    # Try to identify hemisphere from geospatial extent
+                    if xr.attrs.get("geospatial_lat_max", 0) > 80:
+                        self.hemisphere = "north"
+                    elif xr.attrs.get("geospatial_lat_min", 0) < -80:
+                        self.hemisphere = "south"
+                    # Otherwise try to do so from keywords
+                    if not self.hemisphere:
+                        keywords = xr.attrs.get("keywords", "").lower()
+                        if "north" in keywords and "south" not in keywords:
+                            self.hemisphere = "north"
+                        if "south" in keywords and "north" not in keywords:
+                            self.hemisphere = "south"
+                    if not self.hemisphere:
+                        raise InputBlobTriggerException(
+                            "Could not identify hemisphere!"
+                        )
+                    logging.info(
+                        f"{self.log_prefix} Identified data as belonging to the {self.hemisphere}ern hemisphere."
+                    )
+                    # Read array into appropriate data structures
+                    logging.info(
+                        f"{self.log_prefix} Loading forecasts from input data..."
+                    )
+                    self.centroids_m["x"] = [int(1000 * x_km) for x_km in xr.xc.values]
+                    self.centroids_m["y"] = [int(1000 * y_km) for y_km in xr.yc.values]
+                    # Extract only points with a positive mean rather than masking the full grid
+                    sic_mean = xr["sic_mean"].values
+                    sic_stddev = xr["sic_stddev"].transpose(*xr["sic_mean"].dims).values
+                    mask = (sic_mean > 0) & ~np.isnan(sic_stddev)
+                    indices = dict(zip(xr["sic_mean"].dims, np.nonzero(mask)))
+                    self.forecasts = pd.DataFrame(
+                        {
+                            "time": xr["time"].values[indices["time"]],
+                            "leadtime": xr["leadtime"].values[indices["leadtime"]],
+                            "yc": xr["yc"].values[indices["yc"]],
+                            "xc": xr["xc"].values[indices["xc"]],
+                            "sic_mean": sic_mean[mask],
+                            "sic_stddev": sic_stddev[mask],
+                        }
+                    )
+                    del sic_mean, sic_stddev, mask, indices
+                    # Truncate to int4 in the same way as the cell centroids
+                    self.forecasts["xc_m"] = (
+                        1000 * self.forecasts["xc"].to_numpy()
+                    ).astype(np.int32)
+                    self.forecasts["yc_m"] = (
+                        1000 * self.forecasts["yc"].to_numpy()
+                    ).astype(np.int32)
+                    self.forecasts["time_forecast"] = self.forecasts[
+                        "time"
+                    ] + pd.to_timedelta(self.forecasts["leadtime"], unit="D")
+                    self.forecasts.drop(
+                        columns=["yc", "xc", "leadtime"],
+                        inplace=True,
+                    )
+                    logging.info(
+                        f"{self.log_prefix} Loaded {self.forecasts.shape[0]} forecasts from input data."
+                    )
 
         except ValueError as exc:
             logging.error(
@@ -191,11 +262,23 @@ class Processor:
 
     def update_geometries(self) -> None:
         """Update the table of geometries, creating it if necessary."""
-        # Ensure that geometry table exists
+        # Skip grids that have already been loaded by this worker
+        grid = (
+            self.tables["geom"][self.hemisphere],
+            tuple(self.centroids_m["x"]),
+            tuple(self.centroids_m["y"]),
+        )
+        if grid in _LOADED_GRIDS:
+            logging.info(
+                f"{self.log_prefix} Geometries in '{self.tables['geom'][self.hemisphere]}' were already loaded by this worker."
+            )
+            return
+
+        # Ensure that geometry table exists and count the cells it already contains
         logging.info(
             f"{self.log_prefix} Ensuring that geometries table '{self.tables['geom'][self.hemisphere]}' exists..."
         )
-        self.db_execute_and_commit(
+        (n_existing,) = self.db_fetch_one(
             f"""
             CREATE TABLE IF NOT EXISTS {self.tables['geom'][self.hemisphere]} (
                 cell_id SERIAL PRIMARY KEY,
@@ -205,10 +288,12 @@ class Processor:
                 geom_4326 geometry,
                 UNIQUE (centroid_x, centroid_y)
             );
+            CREATE INDEX IF NOT EXISTS {self.tables['geom'][self.hemisphere]}_centroid_x_centroid_y_index ON {self.tables['geom'][self.hemisphere]} (centroid_x, centroid_y) INCLUDE (cell_id);
+            SELECT count(*) FROM {self.tables['geom'][self.hemisphere]};
             """
         )
         logging.info(
-            f"{self.log_prefix} Ensured that geometries table '{self.tables['geom'][self.hemisphere]}' exists."
+            f"{self.log_prefix} Ensured that geometries table '{self.tables['geom'][self.hemisphere]}' exists and contains {n_existing} geometries."
         )
 
         # Calculate the size of the grid cells
@@ -218,49 +303,55 @@ class Processor:
         x_delta_m = int(0.5 * mean_step_size(self.centroids_m["x"]))
         y_delta_m = int(0.5 * mean_step_size(self.centroids_m["y"]))
 
-        # Construct list of geometry records
-        records = []
-        for centroid_x_m in self.centroids_m["x"]:
-            for centroid_y_m in self.centroids_m["y"]:
-                x_min_m, x_max_m = centroid_x_m - x_delta_m, centroid_x_m + x_delta_m
-                y_min_m, y_max_m = centroid_y_m - y_delta_m, centroid_y_m + y_delta_m
-                geometry = Polygon(
-                    [
-                        [x_min_m, y_max_m],
-                        [x_max_m, y_max_m],
-                        [x_max_m, y_min_m],
-                        [x_min_m, y_min_m],
-                        [x_min_m, y_max_m],
-                    ]
-                )
-                records.append((centroid_x_m, centroid_y_m, geometry.wkt))
-        logging.info(f"{self.log_prefix} Identified {len(records)} cell geometries.")
+        n_geometries = len(self.centroids_m["x"]) * len(self.centroids_m["y"])
+        logging.info(f"{self.log_prefix} Identified {n_geometries} cell geometries.")
 
-        # Insert geometries into the database
-        logging.info(
-            f"{self.log_prefix} Ensuring that '{self.tables['geom'][self.hemisphere]}' contains all {len(records)} geometries..."
-        )
-        n_batches = int(math.ceil(len(records) / self.batch_size))
-        progress = Progress(len(records))
-        for idx, record_batch in enumerate(batches(records, self.batch_size), start=1):
-            logging.debug(
-                f"{self.log_prefix} Batch {idx}/{n_batches} :: preparing to insert/update {len(record_batch)} of {progress.total_records} geometries..."
-            )
-            insert_cmd = f"INSERT INTO {self.tables['geom'][self.hemisphere]} (cell_id, centroid_x, centroid_y, geom_{self.projections[self.hemisphere]}, geom_4326) VALUES\n"
-            insert_cmd += ", ".join(
-                [
-                    f"(DEFAULT, {record[0]}, {record[1]}, ST_GeomFromText('{record[2]}', {self.projections[self.hemisphere]}), ST_Transform(ST_GeomFromText('{record[2]}', {self.projections[self.hemisphere]}), 4326))"
-                    for record in record_batch
-                ]
-            )
-            insert_cmd += "ON CONFLICT DO NOTHING;"
-            self.db_execute_and_commit(insert_cmd)
-            progress.add(len(record_batch))
+        # Skip the insert if the table already contains every cell of this grid
+        if n_existing == n_geometries:
+            _LOADED_GRIDS.add(grid)
             logging.info(
-                f"{f'{self.log_prefix} Batch {idx}/{n_batches} :: inserted/updated {progress.processed_records} of {progress.total_records} geometries.':<100} {progress}"
+                f"{self.log_prefix} Geometries in '{self.tables['geom'][self.hemisphere]}' are already up to date."
             )
-            # Explicitly delete collections once used
-            del record_batch
+            return
+
+        # Construct geometries from the grid centroids in the database and insert any that are missing
+        logging.info(
+            f"{self.log_prefix} Ensuring that '{self.tables['geom'][self.hemisphere]}' contains all {n_geometries} geometries..."
+        )
+        progress = Progress(n_geometries)
+        self.db_execute_and_commit(
+            f"""
+            INSERT INTO {self.tables['geom'][self.hemisphere]} (centroid_x, centroid_y, geom_{self.projections[self.hemisphere]}, geom_4326)
+            SELECT centroid_x, centroid_y, geom, ST_Transform(geom, 4326)
+            FROM (
+                SELECT
+                    centroid_x,
+                    centroid_y,
+                    ST_MakeEnvelope(
+                        centroid_x - %(x_delta_m)s,
+                        centroid_y - %(y_delta_m)s,
+                        centroid_x + %(x_delta_m)s,
+                        centroid_y + %(y_delta_m)s,
+                        {self.projections[self.hemisphere]}
+                    ) AS geom
+                FROM
+                    unnest(%(centroids_x_m)s::int4[]) AS centroid_x,
+                    unnest(%(centroids_y_m)s::int4[]) AS centroid_y
+            ) AS cells
+            ON CONFLICT DO NOTHING;
+            """,
+            {
+                "centroids_x_m": self.centroids_m["x"],
+                "centroids_y_m": self.centroids_m["y"],
+                "x_delta_m": x_delta_m,
+                "y_delta_m": y_delta_m,
+            },
+        )
+        progress.add(n_geometries)
+        logging.info(
+            f"{f'{self.log_prefix} Inserted/updated {progress.processed_records} of {progress.total_records} geometries.':<100} {progress}"
+        )
+        _LOADED_GRIDS.add(grid)
         logging.info(
             f"{self.log_prefix} Ensured that '{self.tables['geom'][self.hemisphere]}' contains all geometries."
         )
@@ -292,63 +383,78 @@ class Processor:
             f"{self.log_prefix} Ensured that forecasts table '{self.tables['forecasts'][self.hemisphere]}' exists."
         )
 
-        # Load all existing cells for this hemisphere
-        logging.info(f"{self.log_prefix} Loading geographic cell IDs...")
-        df_cells = pd.io.sql.read_sql_query(
-            f"SELECT cell_id, centroid_x, centroid_y FROM {self.tables['geom'][self.hemisphere]};",
-            self.cnxn,
-        )
-        logging.info(
-            f"{self.log_prefix} Loaded {df_cells.shape[0]} cells from the database."
+        # Construct binary buffer of forecast records directly from the column arrays
+        # Concentrations are sent as scaled int2 values to halve their size on the wire
+        buffer = pgcopy_binary(
+            [
+                (">i4", (self.forecasts["time"] - POSTGRES_EPOCH).dt.days.to_numpy()),
+                (
+                    ">i4",
+                    (
+                        self.forecasts["time_forecast"] - POSTGRES_EPOCH
+                    ).dt.days.to_numpy(),
+                ),
+                (">i4", self.forecasts["xc_m"].to_numpy()),
+                (">i4", self.forecasts["yc_m"].to_numpy()),
+                (">i2", quantise(self.forecasts["sic_mean"].to_numpy())),
+                (">i2", quantise(self.forecasts["sic_stddev"].to_numpy())),
+            ]
         )
 
-        # Insert forecasts into the database
+        # Copy forecasts into a staging table then insert any that are missing
         logging.info(
             f"{self.log_prefix} Ensuring that table '{self.tables['forecasts'][self.hemisphere]}' contains all {self.forecasts.shape[0]} forecasts..."
         )
-        n_batches = int(math.ceil(self.forecasts.shape[0] / self.batch_size))
         progress = Progress(self.forecasts.shape[0])
-        for idx, df_batch in enumerate(
-            batches(self.forecasts, self.batch_size, as_dataframe=True), start=1
-        ):
-            # Add cell IDs by merging forecasts onto pre-loaded cells
-            df_merged = pd.merge(
-                df_batch,
-                df_cells,
-                how="left",
-                left_on=["xc_m", "yc_m"],
-                right_on=["centroid_x", "centroid_y"],
-            )
-            # Insert merged forecasts into database
-            logging.debug(
-                f"{self.log_prefix} Batch {idx}/{n_batches} :: preparing to insert/update {df_merged.shape[0]} of {progress.total_records} forecasts..."
-            )
-            insert_cmd = f"INSERT INTO {self.tables['forecasts'][self.hemisphere]} (forecast_id, date_forecast_generated, date_forecast_for, cell_id, sea_ice_concentration_mean, sea_ice_concentration_stddev) VALUES\n"
-            insert_cmd += ", ".join(
-                [
-                    f"(DEFAULT, '{record.time.date()}', '{record.time_forecast.date()}', {record.cell_id}, {record.sic_mean}, {record.sic_stddev})"
-                    for record in df_merged.itertuples(False)
-                ]
-            )
-            insert_cmd += "ON CONFLICT DO NOTHING;"
-            self.db_execute_and_commit(insert_cmd)
-            progress.add(df_merged.shape[0])
-            logging.info(
-                f"{f'{self.log_prefix} Batch {idx}/{n_batches} :: inserted/updated {progress.processed_records} of {progress.total_records} forecasts.':<100} {progress}"
-            )
-            # Explicitly delete collections once used
-            del df_batch
-            del df_merged
+        self.db_copy_and_commit(
+            f"""
+            SET LOCAL synchronous_commit = off;
+            CREATE TEMP TABLE {self.tables['forecasts'][self.hemisphere]}_stage (
+                date_forecast_generated date,
+                date_forecast_for date,
+                centroid_x int4,
+                centroid_y int4,
+                sea_ice_concentration_mean_q int2,
+                sea_ice_concentration_stddev_q int2
+            ) ON COMMIT DROP;
+            """,
+            f"COPY {self.tables['forecasts'][self.hemisphere]}_stage (date_forecast_generated, date_forecast_for, centroid_x, centroid_y, sea_ice_concentration_mean_q, sea_ice_concentration_stddev_q) FROM STDIN WITH (FORMAT binary);",
+            buffer,
+            f"""
+            ANALYZE {self.tables['forecasts'][self.hemisphere]}_stage;
+            INSERT INTO {self.tables['forecasts'][self.hemisphere]} (date_forecast_generated, date_forecast_for, cell_id, sea_ice_concentration_mean, sea_ice_concentration_stddev)
+            SELECT
+                stage.date_forecast_generated,
+                stage.date_forecast_for,
+                cell.cell_id,
+                (stage.sea_ice_concentration_mean_q / {QUANTISATION_SCALE:.1f})::float4,
+                (stage.sea_ice_concentration_stddev_q / {QUANTISATION_SCALE:.1f})::float4
+            FROM {self.tables['forecasts'][self.hemisphere]}_stage AS stage
+            INNER JOIN {self.tables['geom'][self.hemisphere]} AS cell
+                ON cell.centroid_x = stage.centroid_x AND cell.centroid_y = stage.centroid_y
+            ON CONFLICT DO NOTHING;
+            """,
+        )
+        progress.add(self.forecasts.shape[0])
+        logging.info(
+            f"{f'{self.log_prefix} Inserted/updated {progress.processed_records} of {progress.total_records} forecasts.':<100} {progress}"
+        )
+        # Explicitly delete buffer once used
+        del buffer
         logging.info(
             f"{self.log_prefix} Ensured that table '{self.tables['forecasts'][self.hemisphere]}' contains all {self.forecasts.shape[0]} forecasts."
         )
 
     def update_forecast_meta(self) -> None:
         """Update the forecast meta table, creating it if necessary"""
-        # Ensure that forecast meta table exists
+        # Ensure that forecast meta table exists and update it
+        date_forecast_generated = str(
+            pd.to_datetime(self.forecasts["time"].unique()[0]).date()
+        )
         logging.info(
-            f"{self.log_prefix} Ensuring that forecasts meta table '{self.tables['forecast_meta']}' exists..."
+            f"{self.log_prefix} Updating forecasts meta table '{self.tables['forecast_meta']}' for {date_forecast_generated} ({self.hemisphere}ern hemisphere)..."
         )
+        progress = Progress(1)
         self.db_execute_and_commit(
             f"""
             CREATE TABLE IF NOT EXISTS {self.tables['forecast_meta']} (
@@ -360,20 +466,6 @@ class Processor:
                 n_records bigint,
                 UNIQUE (date_forecast_generated, hemisphere)
             );
-            """
-        )
-        logging.info(
-            f"{self.log_prefix} Ensured that forecasts meta table '{self.tables['forecast_meta']}' exists."
-        )
-        date_forecast_generated = str(
-            pd.to_datetime(self.forecasts["time"].unique()[0]).date()
-        )
-        logging.info(
-            f"{self.log_prefix} Updating forecasts meta table '{self.tables['forecast_meta']}' for {date_forecast_generated} ({self.hemisphere}ern hemisphere)..."
-        )
-        progress = Progress(1)
-        self.db_execute_and_commit(
-            f"""
             INSERT INTO
                 {self.tables['forecast_meta']} (
                     date_forecast_generated,
@@ -408,7 +500,7 @@ class Processor:
 
     def update_latest_forecast(self) -> None:
         """Update the 'latest forecast' view, creating it if necessary"""
-        # Ensure that view table exists
+        # Ensure that view table exists and refresh it
         logging.info(
             f"{self.log_prefix} Updating materialised view '{self.tables['latest'][self.hemisphere]}'..."
         )
@@ -432,18 +524,16 @@ class Processor:
                 WITH NO DATA;
             CREATE INDEX IF NOT EXISTS {self.tables['latest'][self.hemisphere]}_date_forecast_generated_index ON {self.tables['latest'][self.hemisphere]} (date_forecast_generated);
             CREATE INDEX IF NOT EXISTS {self.tables['latest'][self.hemisphere]}_date_forecast_for_index ON {self.tables['latest'][self.hemisphere]} (date_forecast_for);
-            """
-        )
-        logging.info(
-            f"{self.log_prefix} Ensured that materialised view '{self.tables['latest'][self.hemisphere]}' exists in {progress.elapsed}."
-        )
-        logging.info(
-            f"{self.log_prefix} Refreshing materialised view '{self.tables['latest'][self.hemisphere]}'..."
-        )
-        progress = Progress()
-        self.db_execute_and_commit(
-            f"""
-            REFRESH MATERIALIZED VIEW {self.tables['latest'][self.hemisphere]};
+            CREATE UNIQUE INDEX IF NOT EXISTS {self.tables['latest'][self.hemisphere]}_date_forecast_for_cell_id_index ON {self.tables['latest'][self.hemisphere]} (date_forecast_for, cell_id);
+            DO $$
+            BEGIN
+                IF (SELECT ispopulated FROM pg_matviews WHERE matviewname = '{self.tables['latest'][self.hemisphere]}') THEN
+                    REFRESH MATERIALIZED VIEW CONCURRENTLY {self.tables['latest'][self.hemisphere]};
+                ELSE
+                    REFRESH MATERIALIZED VIEW {self.tables['latest'][self.hemisphere]};
+                END IF;
+            END
+            $$;
             """
         )
         logging.info(
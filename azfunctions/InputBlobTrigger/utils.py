@@ -1,35 +1,21 @@
+# Standard library
+import io
+import struct
+
 # Third party
+import numpy as np
 import pandas as pd
 
+PGCOPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack("!ii", 0, 0)
+PGCOPY_TRAILER = struct.pack("!h", -1)
+POSTGRES_EPOCH = pd.Timestamp("2000-01-01")
+QUANTISATION_SCALE = 10000
+
 
 class InputBlobTriggerException(Exception):
     pass
 
 
-def batches(iterable_input, size, as_dataframe=False):
-    """Yield successive chunks of up to 'size' elements from iterable_input."""
-
-    def maybe_df(output_, as_dataframe):
-        """Convert output to a DataFrame or leave it as-is depending on argument"""
-        if as_dataframe:
-            return pd.DataFrame(output_)
-        return output_
-
-    if isinstance(iterable_input, pd.DataFrame):
-        output = []
-        for tuple_ in iterable_input.itertuples(False):
-            output.append(tuple_)
-            if len(output) >= size:
-                yield maybe_df(output, as_dataframe)
-                output = []
-        if output:
-            yield maybe_df(output, as_dataframe)
-            output = []
-    else:
-        for idx in range(0, len(iterable_input), size):
-            yield maybe_df(iterable_input[idx : idx + size], as_dataframe)
-
-
 def human_readable(seconds):
     """Human readable string from seconds"""
     days, seconds = divmod(int(seconds), 86400)
@@ -46,3 +32,25 @@ def human_readable(seconds):
 
 def mean_step_size(input_):
     return (max(input_) - min(input_)) / (len(input_) - 1)
+
+
+def pgcopy_binary(columns):
+    """Encode a list of (big-endian dtype, values) columns as a PostgreSQL binary COPY stream"""
+    fields = [("n_fields", ">i2")]
+    for idx, (dtype, _) in enumerate(columns):
+        fields += [(f"length_{idx}", ">i4"), (f"value_{idx}", dtype)]
+    rows = np.empty(len(columns[0][1]), dtype=fields)
+    rows["n_fields"] = len(columns)
+    for idx, (dtype, values) in enumerate(columns):
+        rows[f"length_{idx}"] = np.dtype(dtype).itemsize
+        rows[f"value_{idx}"] = values
+    buffer = io.BytesIO()
+    buffer.write(PGCOPY_HEADER)
+    buffer.write(rows.tobytes())
+    buffer.write(PGCOPY_TRAILER)
+    return buffer
+
+
+def quantise(values):
+    """Round values in [0, 1] to integers in [0, QUANTISATION_SCALE]"""
+    return np.rint(np.clip(values, 0, 1) * QUANTISATION_SCALE)
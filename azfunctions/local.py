@@ -19,9 +19,12 @@ class FileSystemBlob:
     def __init__(self, filename):
         self.name = filename
         self.length = 0
+        self.file_ = None
 
-    def read(self):
-        return open(self.name, "rb").read()
+    def read(self, size=-1):
+        if not self.file_:
+            self.file_ = open(self.name, "rb")
+        return self.file_.read(size)
 
 
 if __name__ == "__main__":